@@ -1,10 +1,28 @@
 from curl_cffi import requests
-from bs4 import BeautifulSoup
+import lxml.html
 import json
 from datetime import datetime
 import re
 import csv
 
+# orjson is a C extension ~5-10x faster than stdlib json at encoding
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def write_json(filename, data):
+    """Write data as indented UTF-8 JSON, via orjson when available"""
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+# Compiled once at import time instead of per call
+PRICE_RE = re.compile(r'[\d,]+\.?\d*')
+
 class GoldSilverScraper:
     """
     Scraper for gold and silver prices from bajus.org
@@ -16,26 +34,40 @@ class GoldSilverScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
         self.prices = {}
-    
+        self._sessions = {}
+
+    def _get_session(self, impersonation):
+        """Reuse one keep-alive session per impersonation across fetches"""
+        session = self._sessions.get(impersonation)
+        if session is None:
+            session = requests.Session(impersonate=impersonation)
+            session.headers.update(self.headers)
+            self._sessions[impersonation] = session
+        return session
+
+    def close(self):
+        """Close any open sessions"""
+        for session in self._sessions.values():
+            session.close()
+        self._sessions = {}
+
+    def __del__(self):
+        self.close()
+
     def fetch_page(self):
         """Fetch the webpage with retries"""
         impersonations = [
-            "chrome120", 
-            "chrome110", 
+            "chrome120",
+            "chrome110",
             "chrome100",
             "safari15_3",
             "edge101"
         ]
-        
+
         for imp in impersonations:
             try:
                 print(f"Fetching {self.url} (Impersonation: {imp})...")
-                response = requests.get(
-                    self.url, 
-                    headers=self.headers, 
-                    timeout=30,
-                    impersonate=imp
-                )
+                response = self._get_session(imp).get(self.url, timeout=30)
                 
                 if response.status_code == 403:
                     print(f"⚠ Got 403 Forbidden with {imp}")
@@ -47,14 +79,11 @@ class GoldSilverScraper:
                 print(f"Error fetching page with {imp}: {e}")
         
         return None
-        except Exception as e:
-            print(f"Error fetching page: {e}")
-            return None
-    
+
     def parse_prices(self, html_content):
         """Parse prices from HTML content"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
+        root = lxml.html.fromstring(html_content)
+
         prices_data = {
             'timestamp': datetime.now().isoformat(),
             'url': self.url,
@@ -65,19 +94,24 @@ class GoldSilverScraper:
         }
         
         # Extract all tables
-        tables = soup.find_all('table')
-        
+        tables = root.xpath('.//table')
+
+        # Numbers harvested from the cells we visit, instead of scanning
+        # the text of the whole document (scripts, menus, ...)
+        numbers = []
+
         for table_idx, table in enumerate(tables):
-            table_data = {
-                'table_number': table_idx + 1,
-                'rows': []
-            }
-            
-            rows = table.find_all('tr')
+            # Plain list of cell-text rows; the table number is its position
+            table_rows = []
+
+            rows = table.xpath('.//tr')
             for row in rows:
-                cells = row.find_all(['td', 'th'])
-                row_data = [cell.get_text(strip=True) for cell in cells]
-                table_data['rows'].append(row_data)
+                cells = row.xpath('./td|./th')
+                row_data = [(cell.text_content() or '').strip() for cell in cells]
+                table_rows.append(row_data)
+
+                for cell_text in row_data:
+                    numbers.extend(PRICE_RE.findall(cell_text))
                 
                 # Check for gold/silver keywords
                 row_text = ' '.join(row_data).lower()
@@ -89,33 +123,21 @@ class GoldSilverScraper:
                     prices_data['silver']['table'] = table_idx + 1
                     prices_data['silver']['row_data'] = row_data
             
-            prices_data['all_tables'].append(table_data)
-        
-        # Extract all numbers that look like prices
-        all_text = soup.get_text()
-        price_pattern = r'[\d,]+\.?\d*'
-        numbers = re.findall(price_pattern, all_text)
+            prices_data['all_tables'].append(table_rows)
         
+        # Filter and dedupe in one pass (dict preserves insertion order)
+        seen = {}
         for num_str in numbers:
             try:
                 num = float(num_str.replace(',', ''))
-                if num > 50:  # Likely a price
-                    prices_data['all_prices'].append({
-                        'value': num,
-                        'original': num_str
-                    })
             except:
-                pass
-        
-        # Remove duplicates
-        seen = set()
-        unique_prices = []
-        for p in prices_data['all_prices']:
-            if p['value'] not in seen:
-                seen.add(p['value'])
-                unique_prices.append(p)
-        
-        prices_data['all_prices'] = unique_prices[:50]  # Top 50 unique prices
+                continue
+            if num > 50 and num not in seen:  # Likely a price
+                seen[num] = num_str
+                if len(seen) == 50:  # Top 50 unique prices
+                    break
+
+        prices_data['all_prices'] = [{'value': num, 'original': num_str} for num, num_str in seen.items()]
         
         return prices_data
     
@@ -130,8 +152,7 @@ class GoldSilverScraper:
     def save_json(self, filename='prices.json'):
         """Save to JSON"""
         if self.prices:
-            with open(filename, 'w', encoding='utf-8') as f:
-                json.dump(self.prices, f, indent=2, ensure_ascii=False)
+            write_json(filename, self.prices)
             print(f"Saved to {filename}")
     
     def save_csv(self, filename='prices.csv'):
@@ -146,9 +167,9 @@ class GoldSilverScraper:
                 writer.writerow([])
                 
                 # Write all table data
-                for table in self.prices['all_tables']:
-                    writer.writerow([f"Table {table['table_number']}"])
-                    for row in table['rows']:
+                for table_num, table_rows in enumerate(self.prices['all_tables'], 1):
+                    writer.writerow([f"Table {table_num}"])
+                    for row in table_rows:
                         writer.writerow(row)
                     writer.writerow([])
             
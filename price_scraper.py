@@ -1,5 +1,7 @@
 from curl_cffi import requests
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, asdict
 import json
 from datetime import datetime
 import re
@@ -7,15 +9,47 @@ import csv
 import os
 import sys
 
+# Compiled once at import time instead of per call
+PRICE_RE = re.compile(r'[\d,]+\.?\d*')
+CARAT_RE = re.compile(r'^(18|21|22)(\s+karat)?$', re.I)
+GOLD_RE = re.compile(r'gold|সোনা', re.I)
+SILVER_RE = re.compile(r'silver|রূপা|রুপা', re.I)
+
+# orjson is a C extension ~5-10x faster than stdlib json at encoding
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def write_json(filename, data):
+    """Write data as indented UTF-8 JSON, via orjson when available"""
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False, default=asdict)
+
 # Force UTF-8 encoding for Windows console
 if sys.platform == 'win32':
     sys.stdout.reconfigure(encoding='utf-8')
 
+@dataclass(slots=True)
+class PriceEntry:
+    """One extracted price cell; slots keep the many entries small"""
+    value: float
+    original_text: str
+    row: list
+    timestamp: str
+    table: int
+
 class PriceScraper:
     """
     Advanced scraper for gold and silver prices with categorization and history
     """
-    
+
+    CATS = ('22_carat', '21_carat', '18_carat', 'traditional')
+
     def __init__(self):
         self.url = "https://www.bajus.org/gold-price"
         self.headers = {
@@ -40,8 +74,27 @@ class PriceScraper:
             'date': datetime.now().strftime('%Y-%m-%d'),
             'url': self.url
         }
+        self._sessions = {}
         self.create_directories()
-    
+
+    def _get_session(self, impersonation):
+        """Reuse one keep-alive session per impersonation across fetches"""
+        session = self._sessions.get(impersonation)
+        if session is None:
+            session = requests.Session(impersonate=impersonation)
+            session.headers.update(self.headers)
+            self._sessions[impersonation] = session
+        return session
+
+    def close(self):
+        """Close any open sessions"""
+        for session in self._sessions.values():
+            session.close()
+        self._sessions = {}
+
+    def __del__(self):
+        self.close()
+
     def create_directories(self):
         """Create necessary directories for storing data"""
         directories = [
@@ -57,63 +110,63 @@ class PriceScraper:
             print(f"✓ Directory created/exists: {directory}")
     
     def fetch_page(self):
-        """Fetch the webpage with retries and different impersonations"""
+        """Fetch the webpage, racing all impersonations concurrently"""
         impersonations = [
-            "chrome120", 
-            "chrome110", 
+            "chrome120",
+            "chrome110",
             "chrome100",
             "safari15_3",
             "edge101"
         ]
-        
-        for imp in impersonations:
-            try:
-                print(f"\n📥 Fetching {self.url} (Impersonation: {imp})...")
-                response = requests.get(
-                    self.url, 
-                    headers=self.headers, 
-                    timeout=30,
-                    impersonate=imp
-                )
-                
-                # If we get a 403, raise specifically to trigger retry
-                if response.status_code == 403:
-                    print(f"⚠ Got 403 Forbidden with {imp}")
+
+        def fetch_with(imp):
+            response = self._get_session(imp).get(self.url, timeout=30)
+            # A 403 means this impersonation was blocked — treat as failure
+            if response.status_code == 403:
+                raise Exception(f"403 Forbidden")
+            response.raise_for_status()
+            return response.content
+
+        print(f"\n📥 Fetching {self.url} ({len(impersonations)} impersonations in parallel)...")
+        executor = ThreadPoolExecutor(max_workers=len(impersonations))
+        try:
+            futures = {executor.submit(fetch_with, imp): imp for imp in impersonations}
+            for future in as_completed(futures):
+                try:
+                    content = future.result()
+                except Exception as e:
+                    print(f"✗ Error fetching page with {futures[future]}: {e}")
                     continue
-                    
-                response.raise_for_status()
-                print("✓ Page fetched successfully")
-                return response.content
-            except Exception as e:
-                print(f"✗ Error fetching page with {imp}: {e}")
-        
+                print(f"✓ Page fetched successfully ({futures[future]})")
+                return content
+        finally:
+            # Don't wait for the losers — abandon them and move on
+            executor.shutdown(wait=False, cancel_futures=True)
+
         print("❌ All attempts failed.")
         return None
     
     def extract_price_value(self, text):
         """Extract numeric price value from text"""
-        # Remove common currency symbols and text
-        text = str(text).replace('৳', '').replace('TK', '').replace('BDT', '').strip()
-        
-        # Extract numbers
-        match = re.search(r'[\d,]+\.?\d*', text)
+        # PRICE_RE only matches digits/commas, so currency symbols and
+        # labels (৳, TK, BDT) are skipped without stripping them first
+        match = PRICE_RE.search(str(text))
         if match:
             try:
-                value = float(match.group().replace(',', ''))
-                return value
+                return float(match.group().replace(',', ''))
             except:
                 return None
         return None
     
-    def categorize_price(self, row_text, price_value):
-        """Categorize price based on carat type"""
+    def categorize_price(self, row_text):
+        """Categorize a row based on carat type"""
         row_lower = row_text.lower()
-        
-        if '22' in row_lower or '22 carat' in row_lower:
+
+        if '22' in row_lower:
             return '22_carat'
-        elif '21' in row_lower or '21 carat' in row_lower:
+        elif '21' in row_lower:
             return '21_carat'
-        elif '18' in row_lower or '18 carat' in row_lower:
+        elif '18' in row_lower:
             return '18_carat'
         elif 'traditional' in row_lower or 'ট্র্যাডিশনাল' in row_text:
             return 'traditional'
@@ -122,146 +175,118 @@ class PriceScraper:
     
     def parse_prices(self, html_content):
         """Parse prices from HTML content"""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        
+        tree = LexborHTMLParser(html_content)
+
         print("\n🔍 Parsing prices...")
-        
+
         # Extract all tables
-        tables = soup.find_all('table')
+        tables = tree.css('table')
         print(f"Found {len(tables)} tables")
-        
-        for table_idx, table in enumerate(tables):
-            rows = table.find_all('tr')
-            
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                row_data = [cell.get_text(strip=True) for cell in cells]
-                row_text = ' '.join(row_data)
-                
-                if not row_text.strip():
+
+        # Flatten the table walk into one pass of (table number, cell texts)
+        all_rows = [
+            (table_num, [cell.text(strip=True) for cell in row.css('td, th')])
+            for table_num, table in enumerate(tables, 1)
+            for row in table.css('tr')
+        ]
+
+        for table_num, row_data in all_rows:
+            row_text = ' '.join(row_data)
+
+            if not row_text.strip():
+                continue
+
+            # Classify the row once, then walk its cells once
+            is_gold = GOLD_RE.search(row_text) is not None
+            is_silver = SILVER_RE.search(row_text) is not None
+            if not (is_gold or is_silver):
+                continue
+
+            if is_gold:
+                print(f"\n🥇 Gold row found: {row_text[:80]}")
+            if is_silver:
+                print(f"\n🥈 Silver row found: {row_text[:80]}")
+
+            # The category is a property of the row, not of each cell
+            category = self.categorize_price(row_text)
+
+            # Extract all prices from this row
+            for cell_text in row_data:
+                # Skip cells that only contain carat numbers
+                if CARAT_RE.match(cell_text):
                     continue
-                
-                # Check for gold prices
-                if 'gold' in row_text.lower() or 'সোনা' in row_text:
-                    print(f"\n🥇 Gold row found: {row_text[:80]}")
-                    
-                    # Extract all prices from this row
-                    for cell_text in row_data:
-                        # Skip cells that only contain carat numbers
-                        if re.match(r'^(18|21|22)(\s+karat)?$', cell_text.lower()):
-                            continue
-                            
-                        price = self.extract_price_value(cell_text)
-                        # Gold prices are typically > 1000 per gram or > 50000 per bhori
-                        if price and price > 1000:
-                            category = self.categorize_price(row_text, price)
-                            
-                            price_entry = {
-                                'value': price,
-                                'original_text': cell_text,
-                                'row': row_data,
-                                'timestamp': datetime.now().isoformat(),
-                                'table': table_idx + 1
-                            }
-                            
-                            self.prices['gold'][category].append(price_entry)
-                            self.prices['gold']['all'].append(price_entry)
-                            print(f"  ✓ {category}: {price}")
-                
-                # Check for silver prices
-                if 'silver' in row_text.lower() or 'রূপা' in row_text or 'রুপা' in row_text:
-                    print(f"\n🥈 Silver row found: {row_text[:80]}")
-                    
-                    # Extract all prices from this row
-                    for cell_text in row_data:
-                        # Skip cells that only contain carat numbers
-                        if re.match(r'^(18|21|22)(\s+karat)?$', cell_text.lower()):
-                            continue
-                            
-                        price = self.extract_price_value(cell_text)
-                        # Silver prices are typically > 100 but < 10000
-                        if price and price > 100:
-                            category = self.categorize_price(row_text, price)
-                            
-                            price_entry = {
-                                'value': price,
-                                'original_text': cell_text,
-                                'row': row_data,
-                                'timestamp': datetime.now().isoformat(),
-                                'table': table_idx + 1
-                            }
-                            
-                            self.prices['silver'][category].append(price_entry)
-                            self.prices['silver']['all'].append(price_entry)
-                            print(f"  ✓ silver_{category}: {price}")
-    
-    def save_gold_json(self):
-        """Save gold prices to JSON"""
-        filename = 'data/gold/gold_prices.json'
-        gold_data = {
-            'timestamp': self.prices['timestamp'],
-            'url': self.prices['url'],
-            'prices': self.prices['gold']
-        }
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(gold_data, f, indent=2, ensure_ascii=False)
-        print(f"✓ Gold prices saved to {filename}")
-    
-    def save_silver_json(self):
-        """Save silver prices to JSON"""
-        filename = 'data/silver/silver_prices.json'
-        silver_data = {
-            'timestamp': self.prices['timestamp'],
-            'url': self.prices['url'],
-            'prices': self.prices['silver']
-        }
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(silver_data, f, indent=2, ensure_ascii=False)
-        print(f"✓ Silver prices saved to {filename}")
-    
-    def save_gold_csv(self):
-        """Save gold prices to CSV"""
-        filename = 'data/gold/gold_prices.csv'
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Timestamp', self.prices['timestamp']])
-            writer.writerow(['URL', self.prices['url']])
-            writer.writerow([])
-            for cat in ['22_carat', '21_carat', '18_carat', 'traditional']:
-                writer.writerow([cat.replace('_', ' ').capitalize()])
-                writer.writerow(['Price', 'Original Text', 'Table', 'Time'])
-                for entry in self.prices['gold'][cat]:
-                    writer.writerow([entry['value'], entry['original_text'], entry['table'], entry['timestamp']])
-                writer.writerow([])
-        print(f"✓ Gold prices saved to {filename}")
-    
-    def save_silver_csv(self):
-        """Save silver prices to CSV"""
-        filename = 'data/silver/silver_prices.csv'
-        with open(filename, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.writer(f)
-            writer.writerow(['Timestamp', self.prices['timestamp']])
-            writer.writerow(['URL', self.prices['url']])
-            writer.writerow([])
-            for cat in ['22_carat', '21_carat', '18_carat', 'traditional']:
-                writer.writerow([cat.replace('_', ' ').capitalize() + " Silver"])
-                writer.writerow(['Price', 'Original Text', 'Table', 'Time'])
-                for entry in self.prices['silver'][cat]:
-                    writer.writerow([entry['value'], entry['original_text'], entry['table'], entry['timestamp']])
-                writer.writerow([])
-        print(f"✓ Silver prices saved to {filename}")
+
+                price = self.extract_price_value(cell_text)
+                if not price:
+                    continue
+
+                # Gold prices are typically > 1000 per gram or > 50000 per bhori,
+                # silver prices > 100 but < 10000
+                match_gold = is_gold and price > 1000
+                match_silver = is_silver and 100 < price < 10000
+                if not (match_gold or match_silver):
+                    continue
+
+                price_entry = PriceEntry(
+                    value=price,
+                    original_text=cell_text,
+                    row=row_data,
+                    timestamp=self.prices['timestamp'],
+                    table=table_num
+                )
+
+                if match_gold:
+                    self.prices['gold'][category].append(price_entry)
+                    self.prices['gold']['all'].append(price_entry)
+                    print(f"  ✓ {category}: {price}")
+
+                if match_silver:
+                    self.prices['silver'][category].append(price_entry)
+                    self.prices['silver']['all'].append(price_entry)
+                    print(f"  ✓ silver_{category}: {price}")
     
+    def _save_metal(self, metal, fmt):
+        """Save one metal's prices to data/{metal}/{metal}_prices.{fmt}"""
+        filename = f'data/{metal}/{metal}_prices.{fmt}'
+
+        if fmt == 'json':
+            write_json(filename, {
+                'timestamp': self.prices['timestamp'],
+                'url': self.prices['url'],
+                'prices': self.prices[metal]
+            })
+        else:
+            rows = [
+                ['Timestamp', self.prices['timestamp']],
+                ['URL', self.prices['url']],
+                []
+            ]
+            for cat in self.CATS:
+                label = cat.replace('_', ' ').capitalize()
+                if metal == 'silver':
+                    label += ' Silver'
+                rows.append([label])
+                rows.append(['Price', 'Original Text', 'Table', 'Time'])
+                rows.extend(
+                    [entry.value, entry.original_text, entry.table, entry.timestamp]
+                    for entry in self.prices[metal][cat]
+                )
+                rows.append([])
+            with open(filename, 'w', newline='', encoding='utf-8') as f:
+                csv.writer(f).writerows(rows)
+
+        print(f"✓ {metal.capitalize()} prices saved to {filename}")
+
     def save_raw_data(self):
         """Save raw summary data"""
         filename = 'data/raw/raw_data.json'
         raw_data = {
             'timestamp': self.prices['timestamp'],
             'url': self.prices['url'],
-            'gold_summary': {cat: len(self.prices['gold'][cat]) for cat in ['22_carat', '21_carat', '18_carat', 'traditional', 'all']},
-            'silver_summary': {cat: len(self.prices['silver'][cat]) for cat in ['22_carat', '21_carat', '18_carat', 'traditional', 'all']}
+            'gold_summary': {cat: len(self.prices['gold'][cat]) for cat in self.CATS + ('all',)},
+            'silver_summary': {cat: len(self.prices['silver'][cat]) for cat in self.CATS + ('all',)}
         }
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(raw_data, f, indent=2, ensure_ascii=False)
+        write_json(filename, raw_data)
         print(f"✓ Raw data summary saved to {filename}")
 
     def get_averages(self, metal_type):
@@ -282,60 +307,67 @@ class PriceScraper:
         for category, key in mapping.items():
             entries = self.prices[metal_type][category]
             if entries:
-                averages[key] = int(sum(e['value'] for e in entries) / len(entries))
+                averages[key] = int(sum(e.value for e in entries) / len(entries))
         return averages
 
+    def _update_history_csv(self, csv_file, averages):
+        """
+        Append today's row, or replace it in place if it already exists.
+        History rows are written in date order and only today's row ever
+        changes, so it can only be the last line of the file — no need to
+        read or rewrite the rest.
+        """
+        fields = ['date', 'k18', 'k21', 'k22', 'traditional']
+
+        if not os.path.isfile(csv_file):
+            with open(csv_file, 'w', newline='', encoding='utf-8', buffering=1 << 20) as f:
+                writer = csv.DictWriter(f, fieldnames=fields)
+                writer.writeheader()
+                writer.writerow(averages)
+            return
+
+        # One buffered handle does both the truncate and the append. The
+        # values are an ISO date and plain numbers, so the row needs no
+        # CSV quoting and can be written directly.
+        line = ','.join(str(averages[key]) for key in fields) + '\r\n'
+        with open(csv_file, 'rb+', buffering=1 << 20) as f:
+            f.seek(0, os.SEEK_END)
+            size = f.tell()
+            chunk = min(size, 4096)
+            f.seek(size - chunk)
+            tail = f.read(chunk).rstrip(b'\r\n')
+            cut = tail.rfind(b'\n')
+            last_line = tail[cut + 1:]
+            if last_line.split(b',', 1)[0] == averages['date'].encode('utf-8') and cut >= 0:
+                f.truncate(size - chunk + cut + 1)
+            f.seek(0, os.SEEK_END)
+            f.write(line.encode('utf-8'))
+
+    def _update_history_json(self, json_file, averages):
+        """Update today's entry (always the last one) and rewrite atomically"""
+        json_rows = []
+        if os.path.isfile(json_file):
+            try:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    json_rows = json.load(f)
+            except: pass
+
+        if json_rows and json_rows[-1].get('date') == averages['date']:
+            json_rows[-1] = averages
+        else:
+            json_rows.append(averages)
+
+        tmp_file = json_file + '.tmp'
+        write_json(tmp_file, json_rows)
+        os.replace(tmp_file, json_file)
+
     def save_history(self):
         """Save historical data for gold and silver"""
         for metal in ['gold', 'silver']:
             averages = self.get_averages(metal)
-            csv_file = f'data/history/{metal}_history.csv'
-            json_file = f'data/history/{metal}_history.json'
-            
-            # Save CSV
-            rows = []
-            if os.path.isfile(csv_file):
-                with open(csv_file, 'r', encoding='utf-8') as f:
-                    rows = list(csv.DictReader(f))
-            
-            # Update or append
-            found = False
-            for row in rows:
-                if row.get('date') == averages['date']:
-                    for key in ['k22', 'k21', 'k18', 'traditional']:
-                        row[key] = averages[key]
-                    found = True
-                    break
-            if not found:
-                rows.append(averages)
-            
-            rows.sort(key=lambda x: x['date'])
-            with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=['date', 'k18', 'k21', 'k22', 'traditional'])
-                writer.writeheader()
-                writer.writerows(rows)
-            
-            # Save JSON
-            json_rows = []
-            if os.path.isfile(json_file):
-                try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        json_rows = json.load(f)
-                except: pass
-            
-            found = False
-            for i, entry in enumerate(json_rows):
-                if entry.get('date') == averages['date']:
-                    json_rows[i] = averages
-                    found = True
-                    break
-            if not found:
-                json_rows.append(averages)
-            
-            json_rows.sort(key=lambda x: x['date'])
-            with open(json_file, 'w', encoding='utf-8') as f:
-                json.dump(json_rows, f, indent=2)
-            
+            self._update_history_csv(f'data/history/{metal}_history.csv', averages)
+            self._update_history_json(f'data/history/{metal}_history.json', averages)
+
             print(f"✓ {metal.capitalize()} history updated in data/history/")
 
     def display_summary(self):
@@ -347,9 +379,9 @@ class PriceScraper:
         for metal in ['gold', 'silver']:
             icon = "🥇" if metal == "gold" else "🥈"
             print(f"\n{icon} {metal.upper()} PRICES:")
-            for cat in ['22_carat', '21_carat', '18_carat', 'traditional']:
+            for cat in self.CATS:
                 count = len(self.prices[metal][cat])
-                avg = sum(e['value'] for e in self.prices[metal][cat]) / count if count > 0 else 0
+                avg = sum(e.value for e in self.prices[metal][cat]) / count if count > 0 else 0
                 print(f"  {cat.replace('_', ' ').capitalize()}: {avg:.2f} ({count} entries)")
         print("\n📄 FILES SAVED:")
         print("  ✓ data/history/gold_history.json & .csv")
@@ -361,11 +393,10 @@ class PriceScraper:
         html = self.fetch_page()
         if html:
             self.parse_prices(html)
-            self.save_gold_json()
-            self.save_gold_csv()
-            self.save_silver_json()
-            self.save_silver_csv()
-            
+            for metal in ('gold', 'silver'):
+                self._save_metal(metal, 'json')
+                self._save_metal(metal, 'csv')
+
             # Save history only every 3 hours (e.g., 0, 3, 6, 9, 12, 15, 18, 21)
             # This ensures history only grows at 3-hour intervals
             if datetime.now().hour % 3 == 0:
@@ -1,9 +1,94 @@
+import asyncio
 import requests
+from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 import json
 from datetime import datetime
 import re
 
+# aiohttp lets a batch of pages be fetched concurrently on one thread;
+# without it we fall back to sequential fetches over the shared session
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+# orjson is a C extension ~5-10x faster than stdlib json at encoding
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def write_json(filename, data):
+    """Write data as indented UTF-8 JSON, via orjson when available"""
+    if orjson is not None:
+        with open(filename, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filename, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
+# Use the fast C-based lxml parser when installed, otherwise fall back
+# to the pure-Python stdlib parser
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = 'lxml'
+except ImportError:
+    HTML_PARSER = 'html.parser'
+
+# Compiled once at import time instead of per call
+PRICE_RE = re.compile(r'[\d,]+\.?\d*')
+PRICE_DIV_RE = re.compile(r'price|rate|value', re.I)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+
+_session = None
+
+def get_session():
+    """
+    Return a shared requests.Session so repeated scrapes reuse the
+    same TCP/TLS connection instead of re-handshaking every time
+    """
+    global _session
+    if _session is None:
+        _session = requests.Session()
+        _session.headers.update({
+            'User-Agent': USER_AGENT,
+            'Connection': 'keep-alive'
+        })
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        _session.mount('https://', adapter)
+        _session.mount('http://', adapter)
+    return _session
+
+async def _fetch(session, url):
+    async with session.get(url) as response:
+        response.raise_for_status()
+        return await response.read()
+
+async def _fetch_all(urls):
+    connector = aiohttp.TCPConnector(limit=20, keepalive_timeout=85)
+    async with aiohttp.ClientSession(
+        connector=connector,
+        headers={'User-Agent': USER_AGENT},
+        timeout=aiohttp.ClientTimeout(total=15)
+    ) as session:
+        return await asyncio.gather(*[_fetch(session, url) for url in urls])
+
+def fetch_pages(urls):
+    """
+    Fetch several pages concurrently with aiohttp; with the fallback
+    the pages are fetched one by one over the shared session
+    """
+    if aiohttp is None:
+        pages = []
+        for url in urls:
+            response = get_session().get(url, timeout=15)
+            response.raise_for_status()
+            pages.append(response.content)
+        return pages
+    return asyncio.run(_fetch_all(urls))
+
 def scrape_gold_silver_prices():
     """
     Scrape gold and silver prices from bajus.org
@@ -11,17 +96,11 @@ def scrape_gold_silver_prices():
     url = "https://www.bajus.org/gold-price"
     
     try:
-        # Set headers to mimic a browser request
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
         print(f"Fetching data from {url}...")
-        response = requests.get(url, headers=headers, timeout=15)
-        response.raise_for_status()
-        
+        html = fetch_pages([url])[0]
+
         # Parse the HTML
-        soup = BeautifulSoup(response.content, 'html.parser')
+        soup = BeautifulSoup(html, HTML_PARSER)
         
         prices = {
             'timestamp': datetime.now().isoformat(),
@@ -31,13 +110,14 @@ def scrape_gold_silver_prices():
             'raw_data': []
         }
         
-        # Get all text content
-        all_text = soup.get_text()
-        
         # Look for price tables
         tables = soup.find_all('table')
         print(f"Found {len(tables)} tables on the page")
-        
+
+        # Numbers harvested from the cells we visit, instead of scanning
+        # the text of the whole document (scripts, menus, ...)
+        all_numbers = []
+
         # Extract data from tables
         for idx, table in enumerate(tables):
             rows = table.find_all('tr')
@@ -50,7 +130,10 @@ def scrape_gold_silver_prices():
                 if row_data:
                     print(f"  {row_data}")
                     prices['raw_data'].append(row_data)
-                    
+
+                    for cell_text in row_data:
+                        all_numbers.extend(PRICE_RE.findall(cell_text))
+
                     # Check if this row contains gold or silver data
                     row_text = ' '.join(row_data).lower()
                     if 'gold' in row_text:
@@ -59,7 +142,7 @@ def scrape_gold_silver_prices():
                         prices['silver']['raw_row'] = row_data
         
         # Look for divs with price information
-        divs = soup.find_all('div', class_=re.compile(r'price|rate|value', re.I))
+        divs = soup.find_all('div', class_=PRICE_DIV_RE)
         print(f"\nFound {len(divs)} price-related divs")
         
         for div in divs[:10]:  # Show first 10
@@ -67,10 +150,6 @@ def scrape_gold_silver_prices():
             if text:
                 print(f"  {text[:100]}")
         
-        # Extract all numbers that might be prices
-        price_pattern = r'[\d,]+\.?\d*'
-        all_numbers = re.findall(price_pattern, all_text)
-        
         # Filter for likely prices (numbers > 100)
         likely_prices = []
         for num_str in all_numbers:
@@ -99,8 +178,7 @@ def save_prices_to_json(prices, filename='prices.json'):
     Save scraped prices to a JSON file
     """
     if prices:
-        with open(filename, 'w', encoding='utf-8') as f:
-            json.dump(prices, f, indent=2, ensure_ascii=False)
+        write_json(filename, prices)
         print(f"\nPrices saved to {filename}")
     else:
         print("No prices to save")